@@ -5,13 +5,15 @@ Incluye: Planificación de procesos, Gestión de memoria, Gestión de archivos
 Interfaz: CustomTkinter (GUI moderna)
 """
 
-import time
+import heapq
 import random
-import threading
-from collections import deque
+import itertools
+from array import array
+from collections import deque, OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional, Tuple
 from enum import Enum
+from operator import attrgetter
 import tkinter as tk
 from tkinter import ttk
 
@@ -31,7 +33,7 @@ class ProcessState(Enum):
     WAITING = "ESPERANDO"
     TERMINATED = "TERMINADO"
 
-@dataclass
+@dataclass(slots=True)
 class Process:
     pid: int
     priority: int
@@ -44,7 +46,10 @@ class Process:
     state: ProcessState = ProcessState.NEW
     pages_needed: List[int] = field(default_factory=list)
     file_access: List[str] = field(default_factory=list)
-    color: str = ""
+    color: int = 0
+    _inv_burst: float = field(default=0.0, init=False, repr=False)
+    
+    _color_done = "#95a5a6"
     
     def __post_init__(self):
         if not self.pages_needed:
@@ -53,105 +58,132 @@ class Process:
             files = ["archivo1.txt", "archivo2.txt", "archivo3.txt"]
             self.file_access = random.sample(files, random.randint(1, 2))
         if not self.color:
-            self.color = f"#{random.randint(0, 255):02x}{random.randint(0, 255):02x}{random.randint(0, 255):02x}"
+            self.color = random.getrandbits(24)
+        self._inv_burst = 1.0 / self.burst_time
+    
+    def color_hex(self) -> str:
+        return f"#{self.color:06x}"
+
+class AccessLogEntry(NamedTuple):
+    process: int
+    file: str
+    mode: str
+    status: str
+    tick: int
+
+# Un bit por archivo en la máscara de archivos bloqueados
+FILE_BITS: Dict[str, int] = {
+    "archivo1.txt": 1,
+    "archivo2.txt": 2,
+    "archivo3.txt": 4
+}
 
-@dataclass
-class PageFrame:
-    page_number: Optional[int] = None
-    process_id: Optional[int] = None
-    last_access_time: float = 0
-    load_time: float = 0
+# Cada proceso pide 1 o 2 archivos distintos; los pesos acumulados reproducen
+# elegir primero la cantidad (1/2 cada una) y luego una muestra uniforme
+FILE_COMBINATIONS: List[Tuple[str, ...]] = [
+    combo for k in (1, 2) for combo in itertools.permutations(FILE_BITS, k)
+]
+FILE_CUM_WEIGHTS: List[int] = list(itertools.accumulate(
+    2 if len(combo) == 1 else 1 for combo in FILE_COMBINATIONS
+))
 
 class FileSystem:
     def __init__(self):
-        self.files: Dict[str, threading.Lock] = {
-            "archivo1.txt": threading.Lock(),
-            "archivo2.txt": threading.Lock(),
-            "archivo3.txt": threading.Lock()
-        }
-        self.access_log: List[Dict] = []
+        self._locked_mask = 0
+        self.access_log: "deque[AccessLogEntry]" = deque(maxlen=200)
+        # Se activa con cada entrada nueva del registro; la GUI lo limpia al redibujar
+        self.dirty = True
         self.conflicts: int = 0
     
-    def access_file(self, filename: str, process_id: int, mode: str = "read"):
-        acquired = self.files[filename].acquire(blocking=False)
-        
-        if acquired:
-            self.access_log.append({
-                'process': process_id,
-                'file': filename,
-                'mode': mode,
-                'status': 'SUCCESS',
-                'time': time.time()
-            })
-            time.sleep(0.01)
-            self.files[filename].release()
-            return True
-        else:
+    def access_file(self, filename: str, process_id: int, tick: int, mode: str = "read"):
+        bit = FILE_BITS[filename]
+        
+        if self._locked_mask & bit:
             self.conflicts += 1
-            self.access_log.append({
-                'process': process_id,
-                'file': filename,
-                'mode': mode,
-                'status': 'CONFLICT',
-                'time': time.time()
-            })
+            self.access_log.append(AccessLogEntry(process_id, filename, mode, 'CONFLICT', tick))
+            self.dirty = True
             return False
+        
+        self._locked_mask |= bit
+        try:
+            self.access_log.append(AccessLogEntry(process_id, filename, mode, 'SUCCESS', tick))
+            self.dirty = True
+        finally:
+            self._locked_mask &= ~bit
+        return True
 
 # ==================== GESTIÓN DE MEMORIA ====================
 
 class MemoryManager:
     def __init__(self, num_frames: int = 10):
         self.num_frames = num_frames
-        self.frames: List[PageFrame] = [PageFrame() for _ in range(num_frames)]
+        # Tabla de frames como arreglos paralelos; page_number == -1 indica frame libre
+        self.page_number = array('i', [-1]) * num_frames
+        self.process_id = array('i', [-1]) * num_frames
+        # (process_id, page_number) -> índice de frame, en orden de reemplazo (víctima al inicio)
+        self._lru: "OrderedDict[Tuple[int, int], int]" = OrderedDict()
+        self._free_frames = deque(range(num_frames))
         self.page_faults = 0
         self.page_hits = 0
+        # Se activa al cargar o reemplazar una página; la GUI lo limpia al redibujar
+        self.dirty = True
         self.replacement_algorithm = "LRU"
     
     def access_page(self, page_number: int, process_id: int) -> bool:
-        current_time = time.time()
+        key = (process_id, page_number)
         
-        for frame in self.frames:
-            if frame.page_number == page_number and frame.process_id == process_id:
-                frame.last_access_time = current_time
-                self.page_hits += 1
-                return False
+        idx = self._lru.get(key)
+        if idx is not None:
+            if self.replacement_algorithm != "FIFO":
+                self._lru.move_to_end(key)
+            self.page_hits += 1
+            return False
         
         self.page_faults += 1
-        self._load_page(page_number, process_id, current_time)
+        self._load_page(page_number, process_id)
         return True
     
-    def _load_page(self, page_number: int, process_id: int, current_time: float):
-        for frame in self.frames:
-            if frame.page_number is None:
-                frame.page_number = page_number
-                frame.process_id = process_id
-                frame.last_access_time = current_time
-                frame.load_time = current_time
-                return
-        
-        if self.replacement_algorithm == "FIFO":
-            victim = min(self.frames, key=lambda f: f.load_time)
+    def _load_page(self, page_number: int, process_id: int):
+        if self._free_frames:
+            idx = self._free_frames.popleft()
         else:
-            victim = min(self.frames, key=lambda f: f.last_access_time)
+            _, idx = self._lru.popitem(last=False)
         
-        victim.page_number = page_number
-        victim.process_id = process_id
-        victim.last_access_time = current_time
-        victim.load_time = current_time
+        self.page_number[idx] = page_number
+        self.process_id[idx] = process_id
+        self._lru[(process_id, page_number)] = idx
+        self.dirty = True
     
     def get_memory_usage(self) -> float:
-        occupied = sum(1 for f in self.frames if f.page_number is not None)
-        return (occupied / self.num_frames) * 100
+        return (len(self._lru) / self.num_frames) * 100
 
 # ==================== PLANIFICACIÓN DE PROCESOS ====================
 
 class Scheduler:
-    def __init__(self, algorithm: str = "RR", quantum: int = 2):
+    def __init__(self, algorithm: str = "RR", quantum: int = 2, seed: Optional[int] = None):
         self.algorithm = algorithm
         self.quantum = quantum
+        # Generador propio: no comparte estado con el módulo random global
+        self._rng = random.Random(seed)
         self.ready_queue = deque()
+        # SJF / PRIORITY: montículo de (clave, orden de llegada, proceso)
+        self._heap: List[Tuple[int, int, Process]] = []
+        self._counter = itertools.count()
+        # La estrategia de cola y de quantum se elige una sola vez según el algoritmo
+        self._is_rr = algorithm == "RR"
+        self._execute_slice = quantum if self._is_rr else None
+        if self._is_rr:
+            self._enqueue = self._enqueue_fifo
+            self._dequeue = self._dequeue_fifo
+        else:
+            self._enqueue = self._enqueue_heap
+            self._dequeue = self._dequeue_heap
+            self._heap_key = attrgetter("remaining_time" if algorithm == "SJF" else "priority")
         self.completed_processes: List[Process] = []
+        self.completed_count = 0
         self.current_time = 0
+        # Reloj lógico: un tick por cada paso de ejecución
+        self.tick = 0
         self.metrics = {
             'total_waiting_time': 0,
             'total_turnaround_time': 0,
@@ -161,20 +193,25 @@ class Scheduler:
     def add_process(self, process: Process):
         process.state = ProcessState.READY
         process.arrival_time = self.current_time
+        self._enqueue(process)
+    
+    def _enqueue_fifo(self, process: Process):
         self.ready_queue.append(process)
-        self._sort_queue()
     
-    def _sort_queue(self):
-        if self.algorithm == "SJF":
-            self.ready_queue = deque(sorted(self.ready_queue, key=lambda p: p.remaining_time))
-        elif self.algorithm == "PRIORITY":
-            self.ready_queue = deque(sorted(self.ready_queue, key=lambda p: p.priority))
+    def _enqueue_heap(self, process: Process):
+        heapq.heappush(self._heap, (self._heap_key(process), next(self._counter), process))
+    
+    def _dequeue_fifo(self) -> Optional[Process]:
+        return self.ready_queue.popleft() if self.ready_queue else None
+    
+    def _dequeue_heap(self) -> Optional[Process]:
+        return heapq.heappop(self._heap)[2] if self._heap else None
     
     def get_next_process(self) -> Optional[Process]:
-        if not self.ready_queue:
+        process = self._dequeue()
+        if process is None:
             return None
         
-        process = self.ready_queue.popleft()
         process.state = ProcessState.RUNNING
         
         if process.start_time is None:
@@ -187,16 +224,20 @@ class Scheduler:
         if process.remaining_time <= 0:
             return True
         
-        execution_time = min(self.quantum if self.algorithm == "RR" else process.remaining_time, 
-                           process.remaining_time)
+        tick = self.tick
+        self.tick += 1
+        
+        execution_time = process.remaining_time
+        if self._execute_slice is not None and self._execute_slice < execution_time:
+            execution_time = self._execute_slice
         
         if process.pages_needed:
-            page = random.choice(process.pages_needed)
+            page = self._rng.choice(process.pages_needed)
             memory.access_page(page, process.pid)
         
-        if random.random() < 0.2 and process.file_access:
-            file = random.choice(process.file_access)
-            filesystem.access_file(file, process.pid)
+        if self._rng.random() < 0.2 and process.file_access:
+            file = self._rng.choice(process.file_access)
+            filesystem.access_file(file, process.pid, tick)
         
         process.remaining_time -= execution_time
         self.current_time += execution_time
@@ -210,12 +251,11 @@ class Scheduler:
             return True
         else:
             process.state = ProcessState.READY
-            self.ready_queue.append(process)
-            if self.algorithm != "RR":
-                self._sort_queue()
+            self._enqueue(process)
             return False
     
     def _update_metrics(self, process: Process):
+        self.completed_count += 1
         self.metrics['total_processes'] += 1
         self.metrics['total_waiting_time'] += process.waiting_time
         turnaround = process.finish_time - process.arrival_time
@@ -251,9 +291,18 @@ class OSSimulatorGUI:
         self.memory = None
         self.filesystem = None
         self.processes = []
+        self._total_count = 0
         self.running = False
         self.paused = False
-        self.simulation_thread = None
+        self._step_delay_ms = 500  # Velocidad de simulación
+        self._after_id = None
+        self._mem_canvas_size = (0, 0)
+        self._tree_iids = set()
+        # Ids de items de los canvas, reutilizados entre pasos
+        self._proc_rect_ids: Dict[int, int] = {}
+        self._proc_text_ids: Dict[int, int] = {}
+        self._mem_rect_ids: Dict[int, int] = {}
+        self._mem_text_ids: Dict[int, int] = {}
         
         self.create_widgets()
     
@@ -497,6 +546,9 @@ class OSSimulatorGUI:
         except ValueError:
             return
         
+        if num_proc < 0:
+            return
+        
         self.running = True
         self.paused = False
         
@@ -504,123 +556,167 @@ class OSSimulatorGUI:
         self.memory = MemoryManager(num_frames=frames)
         self.filesystem = FileSystem()
         self.processes = self._generate_processes(num_proc)
+        self._total_count = len(self.processes)
         
         for process in self.processes:
             self.scheduler.add_process(process)
         
+        self._clear_process_table()
+        self._clear_canvases()
+        for process in self.processes:
+            iid = str(process.pid)
+            self.process_tree.insert("", "end", iid=iid, values=self._process_row(process))
+            self._tree_iids.add(iid)
+        
         self.start_btn.configure(state="disabled")
         self.pause_btn.configure(state="normal")
         self.stop_btn.configure(state="normal")
         
-        self.simulation_thread = threading.Thread(target=self.run_simulation, daemon=True)
-        self.simulation_thread.start()
+        self._schedule_step()
     
     def pause_simulation(self):
         self.paused = not self.paused
         text = "▶️ REANUDAR" if self.paused else "⏸️ PAUSAR"
         self.pause_btn.configure(text=text)
+        
+        if self.paused:
+            self._cancel_step()
+        else:
+            self._schedule_step()
     
     def stop_simulation(self):
+        self._cancel_step()
         self.running = False
         self.paused = False
+        self._clear_process_table()
+        self._clear_canvases()
         self.start_btn.configure(state="normal")
         self.pause_btn.configure(state="disabled")
         self.stop_btn.configure(state="disabled")
     
-    def run_simulation(self):
-        step = 0
-        while self.running and (self.scheduler.ready_queue or len(self.scheduler.completed_processes) < len(self.processes)):
-            if self.paused:
-                time.sleep(0.1)
-                continue
-            
-            step += 1
-            process = self.scheduler.get_next_process()
-            
-            if process:
-                self.scheduler.execute_process(process, self.memory, self.filesystem)
-                self.update_ui()
-                time.sleep(0.5)  # Velocidad de simulación
-            else:
-                break
+    def _schedule_step(self):
+        self._after_id = self.root.after(self._step_delay_ms, self._step)
+    
+    def _cancel_step(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def _step(self):
+        self._after_id = None
+        process = self.scheduler.get_next_process()
+        
+        if process is None:
+            self._finish_simulation()
+            return
+        
+        self.scheduler.execute_process(process, self.memory, self.filesystem)
+        self.update_ui()
         
+        if self.scheduler.completed_count < self._total_count:
+            self._schedule_step()
+        else:
+            self._finish_simulation()
+    
+    def _finish_simulation(self):
         self.running = False
-        self.root.after(0, lambda: self.start_btn.configure(state="normal"))
-        self.root.after(0, lambda: self.pause_btn.configure(state="disabled"))
-        self.root.after(0, lambda: self.stop_btn.configure(state="disabled"))
+        self.start_btn.configure(state="normal")
+        self.pause_btn.configure(state="disabled")
+        self.stop_btn.configure(state="disabled")
     
     def update_ui(self):
-        self.root.after(0, self.update_process_table)
-        self.root.after(0, self.update_process_canvas)
-        self.root.after(0, self.update_memory_canvas)
-        self.root.after(0, self.update_metrics)
-        self.root.after(0, self.update_files_log)
+        self.update_process_table()
+        self.update_process_canvas()
+        self.update_metrics()
+        self.update_memory_canvas()
+        self.update_files_log()
     
     def update_process_table(self):
-        for item in self.process_tree.get_children():
-            self.process_tree.delete(item)
-        
-        all_processes = list(self.scheduler.ready_queue) + self.scheduler.completed_processes
-        
-        for process in all_processes:
-            self.process_tree.insert("", "end", values=(
-                process.pid,
-                process.state.value,
-                process.priority,
-                process.burst_time,
-                max(0, process.remaining_time),
-                f"{process.waiting_time:.2f}"
-            ))
+        for process in self.processes:
+            self.process_tree.item(str(process.pid), values=self._process_row(process))
     
-    def update_process_canvas(self):
+    def _process_row(self, process: Process) -> tuple:
+        return (
+            process.pid,
+            process.state.value,
+            process.priority,
+            process.burst_time,
+            max(0, process.remaining_time),
+            f"{process.waiting_time:.2f}"
+        )
+    
+    def _clear_canvases(self):
         self.process_canvas.delete("all")
+        self.memory_canvas.delete("all")
+        self._proc_rect_ids.clear()
+        self._proc_text_ids.clear()
+        self._mem_rect_ids.clear()
+        self._mem_text_ids.clear()
+    
+    def _clear_process_table(self):
+        if self._tree_iids:
+            self.process_tree.delete(*self._tree_iids)
+            self._tree_iids.clear()
+    
+    def update_process_canvas(self):
         width = self.process_canvas.winfo_width()
         height = 200
         
         if width <= 1:
             width = 800
         
-        all_processes = list(self.scheduler.ready_queue) + self.scheduler.completed_processes
-        
-        if not all_processes:
+        if not self._total_count:
             return
         
-        bar_width = width // len(all_processes) - 5
+        bar_width = width // self._total_count - 5
         x = 10
         
-        for process in all_processes:
-            progress = (process.burst_time - process.remaining_time) / process.burst_time
+        for process in self.processes:
+            progress = (process.burst_time - process.remaining_time) * process._inv_burst
             bar_height = int(150 * progress)
             
-            color = process.color if process.state != ProcessState.TERMINATED else "#95a5a6"
-            
-            self.process_canvas.create_rectangle(
-                x, height - bar_height - 30, x + bar_width, height - 30,
-                fill=color, outline="white", width=2
-            )
+            color = process.color_hex() if process.state is not ProcessState.TERMINATED else process._color_done
             
-            self.process_canvas.create_text(
-                x + bar_width // 2, height - 10,
-                text=f"P{process.pid}", fill="white", font=("Arial", 10, "bold")
-            )
+            rect_id = self._proc_rect_ids.get(process.pid)
+            if rect_id is None:
+                self._proc_rect_ids[process.pid] = self.process_canvas.create_rectangle(
+                    x, height - bar_height - 30, x + bar_width, height - 30,
+                    fill=color, outline="white", width=2
+                )
+                self._proc_text_ids[process.pid] = self.process_canvas.create_text(
+                    x + bar_width // 2, height - 10,
+                    text=f"P{process.pid}", fill="white", font=("Arial", 10, "bold")
+                )
+            else:
+                self.process_canvas.coords(rect_id, x, height - bar_height - 30, x + bar_width, height - 30)
+                self.process_canvas.itemconfig(rect_id, fill=color)
+                self.process_canvas.coords(self._proc_text_ids[process.pid], x + bar_width // 2, height - 10)
             
             x += bar_width + 5
     
     def update_memory_canvas(self):
-        self.memory_canvas.delete("all")
         width = self.memory_canvas.winfo_width()
         height = self.memory_canvas.winfo_height()
         
         if width <= 1 or height <= 1:
             return
         
+        if not self.memory.dirty and (width, height) == self._mem_canvas_size:
+            return
+        self.memory.dirty = False
+        self._mem_canvas_size = (width, height)
+        
         cols = 5
         rows = (self.memory.num_frames + cols - 1) // cols
         
         cell_width = (width - 40) // cols
         cell_height = (height - 40) // rows
         
-        for i, frame in enumerate(self.memory.frames):
+        page_numbers = self.memory.page_number
+        process_ids = self.memory.process_id
+        
+        for i in range(self.memory.num_frames):
+            page = page_numbers[i]
             row = i // cols
             col = i % cols
             
@@ -629,21 +725,28 @@ class OSSimulatorGUI:
             x2 = x1 + cell_width - 5
             y2 = y1 + cell_height - 5
             
-            color = "#3498db" if frame.page_number is not None else "#34495e"
-            
-            self.memory_canvas.create_rectangle(
-                x1, y1, x2, y2, fill=color, outline="white", width=2
-            )
+            color = "#3498db" if page != -1 else "#34495e"
             
-            if frame.page_number is not None:
-                text = f"P{frame.process_id}\nPg{frame.page_number}"
+            if page != -1:
+                text = f"P{process_ids[i]}\nPg{page}"
             else:
                 text = "Vacío"
             
-            self.memory_canvas.create_text(
-                (x1 + x2) // 2, (y1 + y2) // 2,
-                text=text, fill="white", font=("Arial", 9, "bold")
-            )
+            rect_id = self._mem_rect_ids.get(i)
+            if rect_id is None:
+                self._mem_rect_ids[i] = self.memory_canvas.create_rectangle(
+                    x1, y1, x2, y2, fill=color, outline="white", width=2
+                )
+                self._mem_text_ids[i] = self.memory_canvas.create_text(
+                    (x1 + x2) // 2, (y1 + y2) // 2,
+                    text=text, fill="white", font=("Arial", 9, "bold")
+                )
+            else:
+                text_id = self._mem_text_ids[i]
+                self.memory_canvas.coords(rect_id, x1, y1, x2, y2)
+                self.memory_canvas.itemconfig(rect_id, fill=color)
+                self.memory_canvas.coords(text_id, (x1 + x2) // 2, (y1 + y2) // 2)
+                self.memory_canvas.itemconfig(text_id, text=text)
     
     def update_metrics(self):
         if not self.scheduler:
@@ -653,7 +756,7 @@ class OSSimulatorGUI:
         mem_usage = self.memory.get_memory_usage()
         
         text = f"""
-Procesos Completados: {metrics['total_processes']}/{len(self.processes)}
+Procesos Completados: {metrics['total_processes']}/{self._total_count}
 
 Tiempo Promedio Espera:
   {metrics['avg_waiting_time']:.2f} unidades
@@ -678,15 +781,18 @@ Conflictos de Archivos:
             self.metrics_text.insert("1.0", text)
     
     def update_files_log(self):
-        if not self.filesystem:
+        if not self.filesystem or not self.filesystem.dirty:
             return
+        self.filesystem.dirty = False
         
         log_text = "REGISTRO DE ACCESO A ARCHIVOS\n"
         log_text += "=" * 50 + "\n\n"
         
-        for entry in self.filesystem.access_log[-20:]:
-            status_icon = "✅" if entry['status'] == 'SUCCESS' else "❌"
-            log_text += f"{status_icon} P{entry['process']} -> {entry['file']} ({entry['mode']}) - {entry['status']}\n"
+        recent = list(itertools.islice(reversed(self.filesystem.access_log), 20))
+        
+        for entry in reversed(recent):
+            status_icon = "✅" if entry.status == 'SUCCESS' else "❌"
+            log_text += f"{status_icon} P{entry.process} -> {entry.file} ({entry.mode}) - {entry.status}\n"
         
         if CTK_AVAILABLE:
             self.files_text.delete("0.0", "end")
@@ -696,16 +802,29 @@ Conflictos de Archivos:
             self.files_text.insert("1.0", log_text)
     
     def _generate_processes(self, num: int) -> List[Process]:
+        # Toda la aleatoriedad se genera en bloque; __post_init__ no tiene nada que completar
+        bursts = random.choices(range(3, 16), k=num)
+        priorities = random.choices(range(1, 11), k=num)
+        page_counts = random.choices(range(3, 9), k=num)
+        pages = random.choices(range(20), k=sum(page_counts))
+        file_combos = random.choices(FILE_COMBINATIONS, cum_weights=FILE_CUM_WEIGHTS, k=num)
+        color_bytes = random.randbytes(3 * num)
+        
         processes = []
+        offset = 0
         for i in range(num):
-            burst_time = random.randint(3, 15)
+            n_pages = page_counts[i]
             process = Process(
                 pid=i,
-                priority=random.randint(1, 10),
-                burst_time=burst_time,
-                remaining_time=burst_time,
-                arrival_time=0
+                priority=priorities[i],
+                burst_time=bursts[i],
+                remaining_time=bursts[i],
+                arrival_time=0,
+                pages_needed=pages[offset:offset + n_pages],
+                file_access=list(file_combos[i]),
+                color=int.from_bytes(color_bytes[3 * i:3 * i + 3], "little")
             )
+            offset += n_pages
             processes.append(process)
         return processes
     